@@ -0,0 +1,398 @@
+import json
+import mmap
+import os
+import re
+import sys
+from array import array
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import orjson
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+# Subset of the negative/profane vocabulary used by the pipeline, for the
+# local (no-LocalStack) analysis pass over the devset.
+PROFANITY_WORDS = frozenset({
+    'damn', 'hell', 'crap', 'stupid', 'hate', 'terrible', 'awful',
+    'worst', 'horrible', 'garbage', 'trash', 'suck', 'sucks', 'idiot',
+    'useless', 'pathetic', 'junk', 'disgusting'
+})
+
+BAN_THRESHOLD = 3
+
+# Texts shorter than the shortest profanity word cannot match at all.
+_MIN_WORD_LEN = min(len(word) for word in PROFANITY_WORDS)
+
+# Characters that count as part of a word for the boundary check around
+# Aho-Corasick matches (avoids substring hits like 'hell' in 'shell').
+_WORD_CHARS = frozenset('abcdefghijklmnopqrstuvwxyz0123456789_')
+
+# Single alternation over the whole vocabulary: the fallback scan is one
+# pass of the C regex engine instead of a tokenize-and-lookup loop. The
+# alternation is small and literal-only, so there is no pathological
+# backtracking.
+_PROFANITY_RE = re.compile(
+    r'\b(?:' + '|'.join(sorted(map(re.escape, PROFANITY_WORDS))) + r')\b',
+    re.IGNORECASE)
+
+# Build the Aho-Corasick automaton once at import time so every review is
+# scanned in a single O(len(text)) pass with all patterns matched
+# simultaneously. Falls back to the tokenize-and-lookup path when the
+# pyahocorasick extension is not installed.
+if ahocorasick is not None:
+    _AUTOMATON = ahocorasick.Automaton()
+    for _word in PROFANITY_WORDS:
+        # Store the length alongside the word so the boundary check does
+        # not recompute len() for every match.
+        _AUTOMATON.add_word(_word, (_word, len(_word)))
+    _AUTOMATON.make_automaton()
+else:
+    _AUTOMATON = None
+
+
+def simple_profanity_check(text):
+    """
+    Check a review text against PROFANITY_WORDS.
+
+    Uses a precompiled Aho-Corasick automaton when available (one pass over
+    the text for all words at once), otherwise falls back to tokenizing the
+    text and testing each word for membership.
+
+    Args:
+        text (str): Raw review text to check.
+
+    Returns:
+        tuple: (contains_profanity (bool), matched words (list))
+    """
+    if not text or not isinstance(text, str) or len(text) < _MIN_WORD_LEN:
+        return False, []
+
+    if _AUTOMATON is not None:
+        # pyahocorasick has no case-insensitive mode, so the automaton
+        # path still pays one case-folded copy of the text.
+        text_lower = text.lower()
+        hits = []
+        append_hit = hits.append
+        word_chars = _WORD_CHARS
+        last_index = len(text_lower) - 1
+        for end, (word, word_len) in _AUTOMATON.iter(text_lower):
+            start = end - word_len + 1
+            if start > 0 and text_lower[start - 1] in word_chars:
+                continue
+            if end < last_index and text_lower[end + 1] in word_chars:
+                continue
+            append_hit(word)
+        return bool(hits), hits
+
+    # Fallback: one pass of the compiled alternation over the raw text.
+    # Case folding happens inside the regex engine, so no lowercased copy
+    # of the whole text is allocated; only the (rare) hits are folded for
+    # the Counter.
+    found = [word.lower() for word in _PROFANITY_RE.findall(text)]
+    return bool(found), found
+
+
+def _chunk_ranges(file_path, num_chunks):
+    """
+    Split the file into newline-aligned (start, end) byte ranges.
+
+    Args:
+        file_path (str): Path to the JSONL devset file.
+        num_chunks (int): Desired number of chunks.
+
+    Returns:
+        list: List of (start, end) tuples covering the whole file.
+    """
+    file_size = os.path.getsize(file_path)
+    if file_size == 0:
+        return []
+    chunk_size = max(1, file_size // num_chunks)
+
+    ranges = []
+    with open(file_path, 'rb') as f:
+        start = 0
+        while start < file_size:
+            end = min(start + chunk_size, file_size)
+            if end < file_size:
+                # Advance to the next newline so no record is split.
+                f.seek(end)
+                f.readline()
+                end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _process_chunk(file_path, start, end, report_progress=False):
+    """
+    Analyze the reviews in one byte range of the devset file.
+
+    Each worker maps the file and walks its own range with mmap.find, so
+    line slices come straight from the page cache and orjson parses the
+    raw bytes without a UTF-8 decode.
+
+    Args:
+        file_path (str): Path to the JSONL devset file.
+        start (int): Byte offset of the first record.
+        end (int): Byte offset just past the last record.
+        report_progress (bool): Whether this worker prints progress.
+
+    Returns:
+        dict: Partial analysis results for this chunk.
+    """
+    results = {
+        'total_reviews': 0,
+        'failed_lines': 0,
+        'positive_reviews': 0,
+        'neutral_reviews': 0,
+        'negative_reviews': 0,
+        'profane_reviews': 0,
+        'profanity_counter': Counter(),
+        # defaultdict skips Counter's __missing__ machinery on the
+        # increment-heavy path; the parent merges into a Counter anyway.
+        'user_profanity_counts': defaultdict(int)
+    }
+    # Ratings are collected into a contiguous float array and bucketed in
+    # one vectorized pass after the walk, instead of branching three ways
+    # in the interpreter for every review.
+    overalls = array('f')
+
+    with open(file_path, 'rb') as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        line_num = 0
+        pos = start
+        while pos < end:
+            newline = mm.find(b'\n', pos, end)
+            if newline < 0:
+                line = mm[pos:end]
+                pos = end
+            else:
+                line = mm[pos:newline]
+                pos = newline + 1
+            line_num += 1
+            try:
+                review = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                if line.strip():
+                    results['failed_lines'] += 1
+                continue
+
+            results['total_reviews'] += 1
+            overalls.append(review.get('overall', 0))
+
+            summary = review.get('summary', '')
+            review_text = review.get('reviewText', '')
+
+            summary_profane, summary_words = simple_profanity_check(summary)
+            text_profane, text_words = simple_profanity_check(review_text)
+
+            if summary_profane or text_profane:
+                results['profane_reviews'] += 1
+                all_words = summary_words + text_words
+                results['profanity_counter'].update(all_words)
+
+                reviewer_id = review.get('reviewerID', 'unknown')
+                results['user_profanity_counts'][reviewer_id] += 1
+
+            if report_progress and line_num % 50000 == 0:
+                print(f"  Processed {line_num} lines in first chunk...", flush=False)
+
+        mm.close()
+
+    # Sentiment from the star rating, matching the pipeline's
+    # positive/neutral/negative buckets, computed as vectorized
+    # comparisons over the whole chunk at once.
+    ratings = np.frombuffer(overalls, dtype=np.float32)
+    results['positive_reviews'] = int((ratings >= 4.0).sum())
+    results['negative_reviews'] = int((ratings <= 2.0).sum())
+    results['neutral_reviews'] = (ratings.size
+                                  - results['positive_reviews']
+                                  - results['negative_reviews'])
+
+    return results
+
+
+def process_reviews(file_path, max_workers=None):
+    """
+    Run sentiment and profanity analysis over the devset file.
+
+    Reviews are independent of each other, so the file is split into
+    newline-aligned byte ranges that are analyzed in parallel worker
+    processes (the hot loop is pure Python and holds the GIL, so threads
+    would not help here). Partial results are merged in the parent.
+
+    Args:
+        file_path (str): Path to the JSONL devset file.
+        max_workers (int, optional): Number of worker processes.
+                                     Defaults to os.cpu_count().
+
+    Returns:
+        dict: Aggregated analysis results.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    ranges = _chunk_ranges(file_path, max_workers)
+
+    results = {
+        'total_reviews': 0,
+        'failed_lines': 0,
+        'positive_reviews': 0,
+        'neutral_reviews': 0,
+        'negative_reviews': 0,
+        'profane_reviews': 0,
+        'profanity_counter': Counter(),
+        'user_profanity_counts': Counter(),
+        'banned_users': []
+    }
+
+    if len(ranges) <= 1:
+        partials = [_process_chunk(file_path, start, end, report_progress=True)
+                    for start, end in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(_process_chunk, file_path, start, end,
+                                       report_progress=(start == 0))
+                       for start, end in ranges]
+            partials = [future.result() for future in futures]
+
+    for partial in partials:
+        results['total_reviews'] += partial['total_reviews']
+        results['failed_lines'] += partial['failed_lines']
+        results['positive_reviews'] += partial['positive_reviews']
+        results['negative_reviews'] += partial['negative_reviews']
+        results['neutral_reviews'] += partial['neutral_reviews']
+        results['profane_reviews'] += partial['profane_reviews']
+        results['profanity_counter'].update(partial['profanity_counter'])
+        results['user_profanity_counts'].update(partial['user_profanity_counts'])
+
+    # Ban decisions need the merged per-user counts, so they are made here
+    # rather than inside the workers. A companion id set keeps the
+    # membership test O(1) instead of rebuilding a list per candidate.
+    banned_ids = set()
+    for reviewer_id, count in results['user_profanity_counts'].items():
+        if count >= BAN_THRESHOLD and reviewer_id not in banned_ids:
+            banned_ids.add(reviewer_id)
+            results['banned_users'].append({
+                'user_id': reviewer_id,
+                'profanity_count': count
+            })
+
+    return results
+
+
+def process_reviews_vectorized(file_path, chunksize=100000):
+    """
+    Vectorized variant of process_reviews built on pandas.
+
+    Reads the devset in chunked DataFrames and classifies whole columns
+    at once: sentiment as NumPy comparisons on the rating column and
+    profanity as a single str.contains pass with the compiled alternation.
+    Assumes a well-formed JSONL file — a malformed line aborts the read
+    instead of being counted into failed_lines.
+
+    Args:
+        file_path (str): Path to the JSONL devset file.
+        chunksize (int): Rows per DataFrame chunk, bounding peak memory.
+
+    Returns:
+        dict: Aggregated analysis results, same shape as process_reviews.
+    """
+    results = {
+        'total_reviews': 0,
+        'failed_lines': 0,
+        'positive_reviews': 0,
+        'neutral_reviews': 0,
+        'negative_reviews': 0,
+        'profane_reviews': 0,
+        'profanity_counter': Counter(),
+        'user_profanity_counts': Counter(),
+        'banned_users': []
+    }
+
+    for chunk in pd.read_json(file_path, lines=True, chunksize=chunksize):
+        for column, default in (('overall', 0.0), ('summary', ''),
+                                ('reviewText', ''), ('reviewerID', 'unknown')):
+            if column not in chunk:
+                chunk[column] = default
+
+        results['total_reviews'] += len(chunk)
+        ratings = chunk['overall'].fillna(0.0).to_numpy()
+        results['positive_reviews'] += int((ratings >= 4.0).sum())
+        results['negative_reviews'] += int((ratings <= 2.0).sum())
+
+        text = chunk['summary'].fillna('') + ' ' + chunk['reviewText'].fillna('')
+        flagged = text.str.contains(_PROFANITY_RE)
+        results['profane_reviews'] += int(flagged.sum())
+
+        if flagged.any():
+            hits = text[flagged].str.findall(_PROFANITY_RE).explode().str.lower()
+            results['profanity_counter'].update(hits.value_counts().to_dict())
+            reviewers = chunk.loc[flagged, 'reviewerID'].fillna('unknown')
+            results['user_profanity_counts'].update(reviewers.value_counts().to_dict())
+
+    results['neutral_reviews'] = (results['total_reviews']
+                                  - results['positive_reviews']
+                                  - results['negative_reviews'])
+
+    banned_ids = set()
+    for reviewer_id, count in results['user_profanity_counts'].items():
+        if count >= BAN_THRESHOLD and reviewer_id not in banned_ids:
+            banned_ids.add(reviewer_id)
+            results['banned_users'].append({
+                'user_id': reviewer_id,
+                'profanity_count': count
+            })
+
+    return results
+
+
+def print_summary(results):
+    """Print a summary of the analysis results and save them to disk."""
+    top_profanity = results['profanity_counter'].most_common(10)
+
+    print("\n--- Devset Analysis Summary ---")
+    print(f"Total reviews analyzed: {results['total_reviews']}")
+    print(f"Failed lines: {results['failed_lines']}")
+    print(f"Positive reviews: {results['positive_reviews']}")
+    print(f"Neutral reviews: {results['neutral_reviews']}")
+    print(f"Negative reviews: {results['negative_reviews']}")
+    print(f"Profane reviews: {results['profane_reviews']}")
+    print(f"Banned users: {len(results['banned_users'])}")
+    print("Top profanity words:")
+    for word, count in top_profanity:
+        print(f"  - {word}: {count}")
+
+    output = {
+        key: value for key, value in results.items()
+        if key not in ('profanity_counter', 'user_profanity_counts')
+    }
+    output['top_profanity_words'] = top_profanity
+
+    with open('devset_analysis_results.json', 'w') as f:
+        json.dump(output, f, indent=2)
+    print("\nResults saved to 'devset_analysis_results.json'")
+
+
+if __name__ == "__main__":
+    FILE_PATH = './data/reviews_devset.json'
+
+    print(f"Analyzing devset at '{FILE_PATH}'...")
+    if '--vectorized' in sys.argv:
+        if pd is None:
+            print("pandas is not installed; falling back to the process-parallel path.")
+            analysis_results = process_reviews(FILE_PATH)
+        else:
+            analysis_results = process_reviews_vectorized(FILE_PATH)
+    else:
+        analysis_results = process_reviews(FILE_PATH)
+    print_summary(analysis_results)
+    sys.stdout.flush()
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Deploy the Lambda functions to LocalStack and run a smoke test against them.
+
+Python counterpart to setup_aws_lambdas.sh: prefers the packaged ZIPs from
+deployments/ (built by package_lambdas.py) and falls back to a minimal
+inline handler per function when a package is missing, so the pipeline
+wiring can still be exercised.
+"""
+import functools
+import io
+import json
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+import orjson
+import requests
+from botocore.config import Config
+from requests.adapters import HTTPAdapter
+
+AWS_ENDPOINT_URL = 'http://localhost:4566'
+LAMBDA_ROLE_ARN = 'arn:aws:iam::000000000000:role/lambda-role'
+LAMBDA_RUNTIME = 'python3.12'
+
+# Module-level session for raw HTTP against LocalStack: everything here
+# talks to the same localhost endpoint, so one keep-alive connection
+# serves every health probe instead of a handshake per call.
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=64))
+HTTP_SESSION.headers['Connection'] = 'keep-alive'
+
+# The three fallback handlers only ever differed in a label and a stage
+# string, so all functions now share one handler (and therefore one ZIP)
+# that reads both from its environment; the per-function values travel
+# in the Environment block of create_function instead of in the code.
+_FALLBACK_CODE = '''import json
+import os
+
+LABEL = os.environ.get('STUB_LABEL', 'Stub')
+STAGE = os.environ.get('STUB_STAGE', 'unknown')
+
+def lambda_handler(event, context):
+    print(f"{LABEL} stub invoked with event: {json.dumps(event)}")
+    return {
+        'statusCode': 200,
+        'body': json.dumps({'message': f'{LABEL.lower()} stub', 'stage': STAGE})
+    }
+'''
+
+# function name -> (deployment package, memory size, stub label, stage)
+FUNCTIONS = {
+    'review-preprocessing-dev': (
+        'deployments/preprocessing_deployment.zip', 2048,
+        'Preprocessing', 'preprocessed',
+    ),
+    'review-profanity-check-dev': (
+        'deployments/profanity_check_deployment.zip', 1024,
+        'Profanity check', 'profanity_checked',
+    ),
+    'review-sentiment-analysis-dev': (
+        'deployments/sentiment_analysis_deployment.zip', 1024,
+        'Sentiment analysis', 'sentiment_analyzed',
+    ),
+}
+
+
+def wait_for_localstack(timeout_seconds=60):
+    """
+    Poll the LocalStack health endpoint until it responds.
+
+    The module-level session is reused across the polls, so the whole
+    loop (and any later raw HTTP) rides one kept-alive connection
+    instead of opening a fresh one per probe.
+
+    Args:
+        timeout_seconds (int): How long to keep polling before giving up.
+
+    Returns:
+        bool: True if LocalStack responded within the timeout.
+    """
+    deadline = time.time() + timeout_seconds
+    health_url = f"{AWS_ENDPOINT_URL}/_localstack/health"
+
+    while time.time() < deadline:
+        try:
+            if HTTP_SESSION.get(health_url, timeout=2).status_code == 200:
+                return True
+        except requests.RequestException:
+            pass
+        time.sleep(1)
+    return False
+
+
+def setup_lambda_client():
+    """
+    Create a boto3 Lambda client pointed at LocalStack.
+
+    The client is shared by concurrent deploy and test threads, so the
+    connection pool is sized well above the thread count and keep-alive is
+    enabled to reuse sockets across the delete/create/invoke sequence.
+    """
+    return boto3.client(
+        'lambda',
+        endpoint_url=AWS_ENDPOINT_URL,
+        aws_access_key_id='test',
+        aws_secret_access_key='test',
+        region_name='us-east-1',
+        config=Config(
+            max_pool_connections=50,
+            retries={'max_attempts': 1},
+            tcp_keepalive=True,
+        ),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def create_lambda_zip(code):
+    """
+    Build an in-memory deployment ZIP for an inline fallback handler.
+
+    Identical code always yields identical bytes, so results are memoized
+    for re-runs and retries. The handlers are under 2 KB, where DEFLATE
+    costs CPU for a saving of a few tens of bytes, so the archive is
+    stored uncompressed.
+
+    Args:
+        code (str): Source of the lambda_function module.
+
+    Returns:
+        bytes: The ZIP archive contents.
+    """
+    zip_buffer = io.BytesIO()
+    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_STORED) as zipf:
+        zipf.writestr('lambda_function.py', code)
+    return zip_buffer.getvalue()
+
+
+# One archive covers every function's fallback: the handler is fully
+# generic, so it is built once at import and shared byte-for-byte.
+_FALLBACK_ZIP = create_lambda_zip(_FALLBACK_CODE)
+
+
+@functools.lru_cache(maxsize=None)
+def load_deployment_package(function_name):
+    """Return the ZIP bytes for a function, preferring the packaged build."""
+    # Memoized like the inline-zip builder: a retried or repeated deploy
+    # reuses the bytes instead of re-reading a multi-MB package from disk.
+    package_path = FUNCTIONS[function_name][0]
+    if os.path.exists(package_path):
+        with open(package_path, 'rb') as f:
+            return f.read()
+    print(f"  No package at {package_path}; using inline fallback handler for {function_name}.")
+    return _FALLBACK_ZIP
+
+
+def deploy_lambda_function(lambda_client, function_name):
+    """
+    Delete any existing version of the function and create it fresh.
+
+    Args:
+        lambda_client: boto3 Lambda client.
+        function_name (str): Name of the function to deploy.
+
+    Returns:
+        bool: True if the deployment succeeded.
+    """
+    zip_data = load_deployment_package(function_name)
+    _, memory_size, label, stage = FUNCTIONS[function_name]
+
+    try:
+        lambda_client.delete_function(FunctionName=function_name)
+        print(f"  Deleted existing function {function_name}.")
+    except lambda_client.exceptions.ResourceNotFoundException:
+        pass
+    except Exception as e:
+        print(f"  Warning: could not delete {function_name}: {e}")
+
+    try:
+        lambda_client.create_function(
+            FunctionName=function_name,
+            Runtime=LAMBDA_RUNTIME,
+            Role=LAMBDA_ROLE_ARN,
+            Handler='lambda_function.lambda_handler',
+            Code={'ZipFile': zip_data},
+            Environment={'Variables': {
+                'AWS_ENDPOINT_URL': 'http://host.docker.internal:4566',
+                # Deployed sentiment functions store gzip final bodies;
+                # readers detect the encoding from object metadata.
+                'COMPRESS_FINAL_REVIEWS': 'true',
+                # Consumed only by the shared fallback handler; the real
+                # packaged functions ignore them.
+                'STUB_LABEL': label,
+                'STUB_STAGE': stage,
+            }},
+            MemorySize=memory_size,
+            Timeout=30,
+        )
+        # Wait only as long as provisioning actually takes instead of a
+        # fixed sleep: the waiter polls the function state and returns as
+        # soon as it goes Active (typically well under the old 3 s).
+        try:
+            lambda_client.get_waiter('function_active_v2').wait(
+                FunctionName=function_name,
+                WaiterConfig={'Delay': 1, 'MaxAttempts': 30},
+            )
+        except Exception as e:
+            print(f"  Warning: could not confirm {function_name} is active: {e}")
+        print(f"  Deployed {function_name}.")
+        return True
+    except Exception as e:
+        print(f"  Failed to deploy {function_name}: {e}")
+        return False
+
+
+def warm_up_lambda_functions(lambda_client):
+    """
+    Fire one asynchronous invocation per deployed function.
+
+    InvocationType='Event' enqueues and returns immediately, so all three
+    containers start provisioning in parallel while the driver moves on;
+    the synchronous smoke tests then hit warm containers instead of each
+    paying a cold start.
+    """
+    for function_name in FUNCTIONS:
+        try:
+            lambda_client.invoke(
+                FunctionName=function_name,
+                InvocationType='Event',
+                Payload=b'{}',
+            )
+        except Exception as e:
+            print(f"  Warning: warm-up invoke failed for {function_name}: {e}")
+
+
+def build_test_event(bucket_name, object_key):
+    """Build a minimal S3 notification event for a smoke-test invoke."""
+    return {
+        'Records': [
+            {
+                's3': {
+                    'bucket': {'name': bucket_name},
+                    'object': {'key': object_key},
+                }
+            }
+        ]
+    }
+
+
+def test_lambda_function(lambda_client, function_name, test_event):
+    """
+    Invoke a deployed function once and report the response status.
+
+    Args:
+        lambda_client: boto3 Lambda client.
+        function_name (str): Name of the function to invoke.
+        test_event (dict): Event payload to send.
+
+    Returns:
+        bool: True if the invocation returned without a function error.
+    """
+    try:
+        # orjson.dumps returns bytes, which boto3 accepts directly; the
+        # stdlib json stays only for pretty-printed output below.
+        response = lambda_client.invoke(
+            FunctionName=function_name,
+            InvocationType='RequestResponse',
+            Payload=orjson.dumps(test_event),
+        )
+        payload = orjson.loads(response['Payload'].read())
+        if response.get('FunctionError'):
+            print(f"  {function_name} returned an error: {json.dumps(payload, indent=2)[:500]}")
+            return False
+        print(f"  {function_name} responded: {json.dumps(payload)[:200]}")
+        return True
+    except Exception as e:
+        print(f"  Failed to invoke {function_name}: {e}")
+        return False
+
+
+def main():
+    """Deploy all Lambda functions concurrently, then smoke-test them."""
+    if not wait_for_localstack():
+        print("LocalStack is not reachable. Run ./setup_environment.sh first.")
+        return 1
+
+    print("Deploying Lambda functions to LocalStack...")
+    lambda_client = setup_lambda_client()
+
+    # The three deployments are independent blocking HTTP round-trips to
+    # LocalStack, so run them in parallel threads.
+    with ThreadPoolExecutor(max_workers=len(FUNCTIONS)) as executor:
+        futures = {
+            executor.submit(deploy_lambda_function, lambda_client, name): name
+            for name in FUNCTIONS
+        }
+        deployment_results = {name: future.result() for future, name in futures.items()}
+
+    deployed = [name for name, ok in deployment_results.items() if ok]
+    failed = [name for name, ok in deployment_results.items() if not ok]
+    print(f"\nDeployed {len(deployed)}/{len(FUNCTIONS)} functions.")
+    if failed:
+        print(f"Failed: {', '.join(failed)}")
+        return 1
+
+    print("\nWarming up functions with async invokes...")
+    warm_up_lambda_functions(lambda_client)
+
+    print("\nSmoke-testing deployed functions...")
+    test_events = {
+        'review-preprocessing-dev': build_test_event('raw-reviews-bucket', 'clean/batch_1_25.jsonl'),
+        'review-profanity-check-dev': build_test_event('processed-reviews-bucket', 'processed/test-review.json'),
+        'review-sentiment-analysis-dev': build_test_event('clean-reviews-bucket', 'clean/test-review.json'),
+    }
+
+    # The smoke tests hit independent functions, so invoke them in
+    # parallel as well.
+    with ThreadPoolExecutor(max_workers=len(test_events)) as executor:
+        futures = {
+            name: executor.submit(test_lambda_function, lambda_client, name, event)
+            for name, event in test_events.items()
+        }
+        test_results = {name: future.result() for name, future in futures.items()}
+
+    if all(test_results.values()):
+        print("\nAll functions deployed and responding.")
+        return 0
+    print("\nSome functions failed their smoke test.")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,55 @@
 import boto3
+import functools
+import gzip
 import json
+import math
+import orjson
 import os
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+# Concurrent S3 readers for the sentiment pass; CLIENT_CONFIG's pool is
+# sized above this so the threads never wait on a connection.
+SENTIMENT_FETCH_WORKERS = 32
+
+# Sentiment label -> report counter, so the tally is one dict lookup per
+# review instead of a chain of string comparisons; unknown labels miss
+# the map and are simply not counted.
+SENTIMENT_FIELDS = {
+    'positive': 'positive_reviews_final',
+    'neutral': 'neutral_reviews_final',
+    'negative': 'negative_reviews_final',
+}
+
+# Shared client tuning: the report issues one GET per final review plus the
+# bucket listings, so keep connections alive and pool enough of them for
+# the whole run instead of paying per-call socket setup. Adaptive retries
+# back off client-side when LocalStack starts throttling the fan-out.
+CLIENT_CONFIG = Config(
+    max_pool_connections=64,
+    tcp_keepalive=True,
+    retries={"max_attempts": 10, "mode": "adaptive"},
+)
+
+# One boto3 session behind every client so botocore loads each service
+# model a single time; the factory is memoized so repeated report runs in
+# the same process reuse the clients — and their warm connection pools —
+# instead of rebuilding them per call.
+_AWS_SESSION = boto3.session.Session()
+
+
+@functools.lru_cache(maxsize=None)
+def get_aws_client(service_name):
+    """Return the shared LocalStack client for one AWS service."""
+    return _AWS_SESSION.client(
+        service_name,
+        endpoint_url=os.environ.get("AWS_ENDPOINT_URL", "http://localhost:4566"),
+        aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID", "test"),
+        aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY", "test"),
+        region_name=os.environ.get("AWS_DEFAULT_REGION", "us-east-1"),
+        config=CLIENT_CONFIG,
+    )
 
 def generate_review_report():
     """
@@ -9,9 +58,6 @@ def generate_review_report():
     """
     # --- Configuration for LocalStack connection ---
     # Ensure these environment variables are set, or replace with direct values
-    aws_access_key_id = os.environ.get("AWS_ACCESS_KEY_ID", "test")
-    aws_secret_access_key = os.environ.get("AWS_SECRET_ACCESS_KEY", "test")
-    aws_default_region = os.environ.get("AWS_DEFAULT_REGION", "us-east-1")
     aws_endpoint_url = os.environ.get("AWS_ENDPOINT_URL", "http://localhost:4566")
 
     # --- Define All Resource Names (from setup_eventbridge.sh and common naming) ---
@@ -23,28 +69,11 @@ def generate_review_report():
     CUSTOMER_PROFANITY_TABLE_NAME = "CustomerProfanityCounts"
     BAN_THRESHOLD_SSM_PARAM = "/my-app/ban_threshold"
 
-    # --- Initialize AWS clients for LocalStack ---
-    s3_client = boto3.client(
-        "s3",
-        endpoint_url=aws_endpoint_url,
-        aws_access_key_id=aws_access_key_id,
-        aws_secret_access_key=aws_secret_access_key,
-        region_name=aws_default_region,
-    )
-    dynamodb_client = boto3.client(
-        "dynamodb",
-        endpoint_url=aws_endpoint_url,
-        aws_access_key_id=aws_access_key_id,
-        aws_secret_access_key=aws_secret_access_key,
-        region_name=aws_default_region,
-    )
-    ssm_client = boto3.client(
-        "ssm",
-        endpoint_url=aws_endpoint_url,
-        aws_access_key_id=aws_access_key_id,
-        aws_secret_access_key=aws_secret_access_key,
-        region_name=aws_default_region,
-    )
+    # --- Shared AWS clients for LocalStack ---
+    s3_client = get_aws_client("s3")
+    dynamodb_client = get_aws_client("dynamodb")
+    ssm_client = get_aws_client("ssm")
+    cloudwatch_client = get_aws_client("cloudwatch")
 
     report_data = {
         "s3_raw_bucket_count": 0,
@@ -65,6 +94,31 @@ def generate_review_report():
 
     # Helper function to count objects in an S3 bucket
     def count_s3_objects(bucket_name):
+        # One CloudWatch datapoint answers what would otherwise be a full
+        # paginated listing; S3 publishes NumberOfObjects daily. LocalStack
+        # setups without the metric just fall through to the listing.
+        try:
+            now = datetime.now(timezone.utc)
+            response = cloudwatch_client.get_metric_statistics(
+                Namespace='AWS/S3',
+                MetricName='NumberOfObjects',
+                Dimensions=[
+                    {'Name': 'BucketName', 'Value': bucket_name},
+                    {'Name': 'StorageType', 'Value': 'AllStorageTypes'},
+                ],
+                StartTime=now - timedelta(days=2),
+                EndTime=now,
+                Period=86400,
+                Statistics=['Average'],
+            )
+            datapoints = response.get('Datapoints')
+            if datapoints:
+                count = int(max(datapoints, key=lambda point: point['Timestamp'])['Average'])
+                print(f"Counted {count} objects in '{bucket_name}' (CloudWatch metric)")
+                return count
+        except Exception:
+            pass
+
         count = 0
         try:
             paginator = s3_client.get_paginator('list_objects_v2')
@@ -87,44 +141,95 @@ def generate_review_report():
         print(f"Warning: Could not retrieve ban threshold from SSM ({e}). Using default: {ban_threshold}")
 
     # --- 2. Count Reviews in Each S3 Bucket ---
-    report_data["s3_raw_bucket_count"] = count_s3_objects(RAW_BUCKET)
-    report_data["s3_processed_bucket_count"] = count_s3_objects(PROCESSED_BUCKET)
-    report_data["s3_clean_bucket_count"] = count_s3_objects(CLEAN_BUCKET)
-    report_data["s3_flagged_bucket_count"] = count_s3_objects(FLAGGED_BUCKET)
-    report_data["s3_final_reviews_bucket_count"] = count_s3_objects(FINAL_REVIEWS_BUCKET)
+    # The five listing chains are independent, so they run concurrently
+    # over the shared client's pool; total time is the slowest bucket
+    # instead of the sum of all five.
+    count_targets = {
+        "s3_raw_bucket_count": RAW_BUCKET,
+        "s3_processed_bucket_count": PROCESSED_BUCKET,
+        "s3_clean_bucket_count": CLEAN_BUCKET,
+        "s3_flagged_bucket_count": FLAGGED_BUCKET,
+        "s3_final_reviews_bucket_count": FINAL_REVIEWS_BUCKET,
+    }
+    with ThreadPoolExecutor(max_workers=len(count_targets)) as executor:
+        for field, count in zip(count_targets,
+                                executor.map(count_s3_objects, count_targets.values())):
+            report_data[field] = count
 
 
     # --- 3. Process Sentiment Counts (from Final Reviews Bucket) ---
     # This loop also doubles as the source for `total_reviews_processed_to_final`
     print(f"Analyzing sentiment from '{FINAL_REVIEWS_BUCKET}' for detailed breakdown...")
+
+    # Only one field of each multi-KB review body is needed, so prefer
+    # S3 Select: the server projects out the sentiment label and ships a
+    # few dozen bytes instead of the whole object. Not every LocalStack
+    # build supports Select, so the first failure flips the flag and the
+    # remaining keys use plain GETs.
+    use_select = True
+
+    def fetch_sentiment_label(key):
+        # One fetch + parse, run on a worker thread; returns the label (or
+        # None) so all counter updates stay on the main thread, lock-free.
+        nonlocal use_select
+        try:
+            if use_select:
+                try:
+                    response = s3_client.select_object_content(
+                        Bucket=FINAL_REVIEWS_BUCKET,
+                        Key=key,
+                        ExpressionType='SQL',
+                        Expression="SELECT s.sentiment_analysis.sentiment_label FROM S3Object s",
+                        InputSerialization={'JSON': {'Type': 'DOCUMENT'}},
+                        OutputSerialization={'JSON': {}},
+                    )
+                    payload = b''.join(event['Records']['Payload']
+                                       for event in response['Payload'] if 'Records' in event)
+                    if payload.strip():
+                        row = orjson.loads(payload)
+                        return next(iter(row.values()), None)
+                    return None
+                except Exception:
+                    use_select = False
+                    print(f"S3 Select unavailable; falling back to full GETs for '{FINAL_REVIEWS_BUCKET}'.")
+
+            response = s3_client.get_object(Bucket=FINAL_REVIEWS_BUCKET, Key=key)
+            body = response['Body'].read()
+            # Producers may store gzip-compressed bodies (the sentiment
+            # Lambda does when COMPRESS_FINAL_REVIEWS is set); the
+            # object's ContentEncoding says which format arrived.
+            if response.get('ContentEncoding') == 'gzip':
+                body = gzip.decompress(body)
+            # orjson parses the raw bytes directly — no separate UTF-8
+            # decode pass over the body, and several times faster than
+            # stdlib json on these small documents.
+            review_json = orjson.loads(body)
+
+            # Assuming your sentiment analysis Lambda adds a 'sentiment_analysis' field
+            return review_json.get('sentiment_analysis', {}).get('sentiment_label')
+        except orjson.JSONDecodeError:
+            print(f"Warning: Could not decode JSON for {key} in {FINAL_REVIEWS_BUCKET}. Skipping detailed sentiment analysis for this file.")
+        except Exception as e:
+            print(f"Warning: Error processing {key} in {FINAL_REVIEWS_BUCKET}: {e}")
+        return None
+
     try:
         paginator = s3_client.get_paginator('list_objects_v2')
-        pages = paginator.paginate(Bucket=FINAL_REVIEWS_BUCKET)
-        for page in pages:
-            if 'Contents' in page:
-                for obj in page['Contents']:
-                    try:
-                        # Get object content
-                        response = s3_client.get_object(Bucket=FINAL_REVIEWS_BUCKET, Key=obj['Key'])
-                        review_content = response['Body'].read().decode('utf-8')
-                        review_json = json.loads(review_content)
-
-                        # Assuming your sentiment analysis Lambda adds a 'sentiment_analysis' field
-                        sentiment_label = review_json.get('sentiment_analysis', {}).get('sentiment_label')
-                        
-                        if sentiment_label == 'positive':
-                            report_data["positive_reviews_final"] += 1
-                        elif sentiment_label == 'neutral':
-                            report_data["neutral_reviews_final"] += 1
-                        elif sentiment_label == 'negative':
-                            report_data["negative_reviews_final"] += 1
-                        # If sentiment is missing or unexpected, it won't be counted in these categories
-                        # but still contributes to total_reviews_processed_to_final.
-
-                    except json.JSONDecodeError:
-                        print(f"Warning: Could not decode JSON for {obj['Key']} in {FINAL_REVIEWS_BUCKET}. Skipping detailed sentiment analysis for this file.")
-                    except Exception as e:
-                        print(f"Warning: Error processing {obj['Key']} in {FINAL_REVIEWS_BUCKET}: {e}")
+        keys = [obj['Key']
+                for page in paginator.paginate(Bucket=FINAL_REVIEWS_BUCKET)
+                for obj in page.get('Contents', [])]
+
+        # Each fetch is an independent millisecond-scale round-trip, so
+        # the scan is latency-bound, not CPU-bound: overlapping the GETs
+        # in a thread pool collapses the wall time to roughly the slowest
+        # in-flight batch.
+        with ThreadPoolExecutor(max_workers=SENTIMENT_FETCH_WORKERS) as executor:
+            for sentiment_label in executor.map(fetch_sentiment_label, keys):
+                field = SENTIMENT_FIELDS.get(sentiment_label)
+                if field:
+                    report_data[field] += 1
+                # If sentiment is missing or unexpected, it won't be counted in these categories
+                # but still contributes to total_reviews_processed_to_final.
 
     except Exception as e:
         print(f"Error accessing '{FINAL_REVIEWS_BUCKET}' for detailed sentiment analysis: {e}")
@@ -132,10 +237,76 @@ def generate_review_report():
     # --- 4. Get Banned Users and Total DynamoDB Items ---
     print(f"Scanning DynamoDB table '{CUSTOMER_PROFANITY_TABLE_NAME}'...")
     try:
-        response = dynamodb_client.scan(TableName=CUSTOMER_PROFANITY_TABLE_NAME)
-        report_data["dynamodb_profanity_table_count"] = response.get('Count', 0)
+        # Banned users are sparse, so prefer querying the BannedIndex GSI
+        # (cost proportional to the number of banned users) over scanning
+        # the whole table and filtering client-side. Tables created before
+        # the index existed fall back to the old scan.
+        items = None
+        try:
+            query_kwargs = {
+                "TableName": CUSTOMER_PROFANITY_TABLE_NAME,
+                "IndexName": "BannedIndex",
+                "KeyConditionExpression": "banned_flag = :t",
+                "ExpressionAttributeValues": {":t": {"S": "true"}},
+            }
+            items = []
+            while True:
+                response = dynamodb_client.query(**query_kwargs)
+                items.extend(response.get('Items', []))
+                last_key = response.get('LastEvaluatedKey')
+                if not last_key:
+                    break
+                query_kwargs["ExclusiveStartKey"] = last_key
+        except Exception as e:
+            print(f"Warning: BannedIndex query unavailable ({e}). Falling back to full table scan.")
+            items = None
+
+        if items is None:
+            # Fallback: a segmented parallel scan, roughly one segment per
+            # MB of table (capped at 8), each worker paginating its own
+            # segment. The projection keeps only the three attributes the
+            # report reads, cutting the payload per item.
+            try:
+                table_info = dynamodb_client.describe_table(TableName=CUSTOMER_PROFANITY_TABLE_NAME)
+                table_size_bytes = table_info['Table'].get('TableSizeBytes', 0)
+            except Exception:
+                table_size_bytes = 0
+            total_segments = max(1, min(8, math.ceil(table_size_bytes / (1024 * 1024))))
+
+            def scan_segment(segment):
+                segment_items = []
+                scan_kwargs = {
+                    "TableName": CUSTOMER_PROFANITY_TABLE_NAME,
+                    "Segment": segment,
+                    "TotalSegments": total_segments,
+                    "ProjectionExpression": "reviewer_id, profanity_review_count, is_banned",
+                }
+                while True:
+                    response = dynamodb_client.scan(**scan_kwargs)
+                    segment_items.extend(response.get('Items', []))
+                    last_key = response.get('LastEvaluatedKey')
+                    if not last_key:
+                        return segment_items
+                    scan_kwargs["ExclusiveStartKey"] = last_key
+
+            items = []
+            with ThreadPoolExecutor(max_workers=total_segments) as executor:
+                for segment_items in executor.map(scan_segment, range(total_segments)):
+                    items.extend(segment_items)
+            # An unfiltered scan returns every row, so the item tally is
+            # also the table count.
+            report_data["dynamodb_profanity_table_count"] = len(items)
+        else:
+            # The total row count comes from table metadata — no reason to
+            # walk the table just to count it.
+            try:
+                table_info = dynamodb_client.describe_table(TableName=CUSTOMER_PROFANITY_TABLE_NAME)
+                report_data["dynamodb_profanity_table_count"] = table_info['Table'].get('ItemCount', 0)
+            except Exception as e:
+                print(f"Warning: could not read table item count ({e}).")
+                report_data["dynamodb_profanity_table_count"] = len(items)
 
-        for item in response.get('Items', []):
+        for item in items:
             reviewer_id = item.get('reviewer_id', {}).get('S')
             profanity_count_str = item.get('profanity_review_count', {}).get('N', '0') # Get as string
             
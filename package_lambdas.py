@@ -8,10 +8,41 @@ import shutil
 import tempfile
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
-PYTHON_VERSION = '3.12' 
+PYTHON_VERSION = '3.12'
 
-def package_lambda(function_name, function_dir):
+WHEELS_DIR = os.path.join('deployments', 'wheelhouse')
+
+# Persistent pip HTTP/wheel cache shared across runs, so repeated
+# packaging does not redownload the same multi-hundred-MB wheel set.
+PIP_CACHE_DIR = '.pip_cache'
+
+def download_wheels(requirement_files, wheels_dir=WHEELS_DIR):
+    """Fetch the wheels for every function's requirements in one pip run"""
+    # The functions share most of their dependencies (boto3, nltk, regex),
+    # so one batched `pip download` resolves the union in a single resolver
+    # pass instead of paying pip startup and index refresh per function.
+    os.makedirs(wheels_dir, exist_ok=True)
+    if any(name.endswith('.whl') for name in os.listdir(wheels_dir)):
+        # A populated wheelhouse is reused as-is; delete it to force a
+        # refresh (e.g. after bumping a requirement).
+        print(f"     Reusing existing wheelhouse at {wheels_dir}")
+        return wheels_dir
+    command = [
+        sys.executable, '-m', 'pip', 'download',
+        '--platform', 'manylinux2014_x86_64',
+        '--only-binary=:all:',
+        '--quiet',
+        '--cache-dir', PIP_CACHE_DIR,
+        '--dest', wheels_dir,
+    ]
+    for requirements_file in requirement_files:
+        command += ['-r', requirements_file]
+    subprocess.run(command, check=True)
+    return wheels_dir
+
+def package_lambda(function_name, function_dir, wheels_dir=None):
     """Package a Lambda function with its dependencies"""
     print(f"  Packaging {function_name}...")
     
@@ -30,17 +61,24 @@ def package_lambda(function_name, function_dir):
         requirements_file = os.path.join(temp_function_path, 'requirements.txt')
         if os.path.exists(requirements_file):
             print(f"     Installing dependencies for {function_name} ...")
-            subprocess.run([
+            # The target dir is a fresh temp directory every run, so
+            # --force-reinstall had nothing to reinstall over; the
+            # persistent cache dir keeps warm runs off the network.
+            install_command = [
                 sys.executable, '-m', 'pip', 'install',
                 '--platform', 'manylinux2014_x86_64',
                 '-r', requirements_file,
                 '-t', temp_function_path,
                 '--quiet',
-                '--force-reinstall', 
-                '--no-cache-dir',
+                '--cache-dir', PIP_CACHE_DIR,
                 '--only-binary=:all:',
                 '--upgrade',
-            ], check=True)
+            ]
+            if wheels_dir:
+                # Everything was already fetched into the shared wheelhouse,
+                # so the install never touches the network or the index.
+                install_command += ['--no-index', '--find-links', wheels_dir]
+            subprocess.run(install_command, check=True)
 
             print(f"     Dependencies for {function_name} installed.")
         else:
@@ -75,18 +113,42 @@ def main():
         ('profanity_check', 'profanity_check'),
         ('sentiment_analysis', 'sentiment_analysis')
     ]
-    
-    packages = []
-    
-    for function_name, function_dir in functions_to_package:
+
+    # One batched download for the union of all requirements; the per-
+    # function installs then resolve offline from the shared wheelhouse.
+    requirement_files = [
+        requirements_file for _, function_dir in functions_to_package
+        for requirements_file in [os.path.join('src', 'lambda_functions', function_dir, 'requirements.txt')]
+        if os.path.exists(requirements_file)
+    ]
+    wheels_dir = None
+    if requirement_files:
         try:
-            package_path = package_lambda(function_name, function_dir)
-            if package_path:
-                packages.append(package_path)
+            wheels_dir = download_wheels(requirement_files)
+            print(f"  Downloaded wheels for all functions into {wheels_dir}")
         except Exception as e:
-            print(f"  Failed to package {function_name}: {e}")
-            # Optionally re-raise or exit here if a single failure should stop the process
-    
+            print(f"  Warning: batched wheel download failed ({e}); installs will hit the index per function.")
+
+    packages = []
+
+    # Each function's packaging is an independent pip subprocess plus a
+    # zip pass in its own temp directory, so the three can run in
+    # parallel; the threads just wait on subprocesses and file I/O.
+    with ThreadPoolExecutor(max_workers=len(functions_to_package)) as executor:
+        futures = [
+            (function_name,
+             executor.submit(package_lambda, function_name, function_dir, wheels_dir=wheels_dir))
+            for function_name, function_dir in functions_to_package
+        ]
+        for function_name, future in futures:
+            try:
+                package_path = future.result()
+                if package_path:
+                    packages.append(package_path)
+            except Exception as e:
+                print(f"  Failed to package {function_name}: {e}")
+                # Optionally re-raise or exit here if a single failure should stop the process
+
     if not packages:
         print("\n  No Lambda functions were successfully packaged.")
         return 1
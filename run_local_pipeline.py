@@ -0,0 +1,577 @@
+#!/usr/bin/env python3
+"""
+Run the review pipeline stages locally against LocalStack.
+
+Simulates the preprocessing, profanity-check, and sentiment stages in-process
+over the devset (no Lambda deployment needed), storing a sample of the
+artifacts in the pipeline's S3 buckets and the per-reviewer profanity counts
+in DynamoDB, then verifies what landed. Useful for exercising the bucket and
+table layout without packaging the functions.
+
+Expects the LocalStack resources from setup_triggers.sh to exist.
+"""
+import json
+import multiprocessing
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+import boto3
+import orjson
+import requests
+from botocore.config import Config
+from requests.adapters import HTTPAdapter, Retry
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+AWS_ENDPOINT_URL = 'http://localhost:4566'
+
+PROCESSED_BUCKET = 'processed-reviews-bucket'
+CLEAN_BUCKET = 'clean-reviews-bucket'
+FLAGGED_BUCKET = 'flagged-reviews-bucket'
+FINAL_REVIEWS_BUCKET = 'final-reviews-bucket'
+CUSTOMER_PROFANITY_TABLE_NAME = 'CustomerProfanityCounts'
+BAN_THRESHOLD = 3
+
+# Store every Nth review's artifacts in S3; counts are always exact.
+S3_SAMPLE_RATE = 10
+
+# Concurrent S3 writers; the session pool above is sized to match.
+S3_WORKERS = 32
+
+# Bound on queued-but-unsent S3 writes: producers block once the drain
+# threads fall this far behind, so memory cannot grow with the dataset.
+S3_QUEUE_SIZE = 4096
+
+# Sampled reviews per NDJSON shard object. One PUT carries a whole shard,
+# amortizing the HTTP round trip across hundreds of records instead of
+# paying it per review.
+SHARD_LINES = 500
+
+# Session for the raw HTTP that remains (the single-threaded health
+# probe), so repeated probes reuse one kept-alive connection. Transient
+# connection drops — LocalStack recycling a worker mid-run — are retried
+# in the adapter with a short backoff instead of surfacing per call.
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=1, pool_maxsize=1,
+                                     max_retries=Retry(total=3, backoff_factor=0.1)))
+SESSION.headers['Connection'] = 'keep-alive'
+
+# All S3 traffic goes through one shared boto3 client: every writer thread
+# plus the verification listings reuse one connection pool and one signing
+# context, so the sockets stay warm across the whole run. The pool is
+# sized well above the writer-thread count so no thread ever waits for a
+# connection.
+S3_CLIENT = boto3.client(
+    's3',
+    endpoint_url=AWS_ENDPOINT_URL,
+    aws_access_key_id='test',
+    aws_secret_access_key='test',
+    region_name='us-east-1',
+    config=Config(max_pool_connections=128, tcp_keepalive=True),
+)
+
+# DynamoDB writes likewise go through one shared client instead of
+# hand-built JSON-1.0 wire requests: boto3 pools the connections, caches
+# the signing state, and parses the response for us.
+DDB_CLIENT = boto3.client(
+    'dynamodb',
+    endpoint_url=AWS_ENDPOINT_URL,
+    aws_access_key_id='test',
+    aws_secret_access_key='test',
+    region_name='us-east-1',
+    config=Config(max_pool_connections=64, tcp_keepalive=True),
+)
+
+
+def verify_localstack_ready():
+    """Check that LocalStack answers on its health endpoint."""
+    try:
+        response = SESSION.get(f"{AWS_ENDPOINT_URL}/_localstack/health", timeout=2)
+        return response.status_code == 200
+    except requests.RequestException:
+        return False
+
+
+def setup_infrastructure():
+    """Make sure the pipeline buckets exist (PUT bucket is idempotent)."""
+    buckets = (PROCESSED_BUCKET, CLEAN_BUCKET, FLAGGED_BUCKET, FINAL_REVIEWS_BUCKET)
+
+    def ensure_bucket(bucket):
+        try:
+            S3_CLIENT.create_bucket(Bucket=bucket)
+        except (S3_CLIENT.exceptions.BucketAlreadyOwnedByYou,
+                S3_CLIENT.exceptions.BucketAlreadyExists):
+            pass
+        except Exception as e:
+            print(f"  Warning: could not ensure bucket {bucket}: {e}")
+
+    # The checks are independent round trips over the shared session, so
+    # overlap them instead of paying the latency four times in series.
+    with ThreadPoolExecutor(max_workers=len(buckets)) as executor:
+        list(executor.map(ensure_bucket, buckets))
+
+
+def store_in_s3(bucket, key, body):
+    """
+    PUT one pre-serialized JSON document into a bucket.
+
+    Args:
+        bucket (str): Target bucket name.
+        key (str): Object key.
+        body (bytes): orjson-encoded document, sent as-is on the wire.
+
+    Returns:
+        bool: True if LocalStack acknowledged the write.
+    """
+    try:
+        S3_CLIENT.put_object(
+            Bucket=bucket,
+            Key=key,
+            Body=body,
+            ContentType='application/json',
+        )
+        return True
+    except Exception as e:
+        print(f"  Warning: S3 put failed for {bucket}/{key}: {e}")
+        return False
+
+
+def _s3_drain(write_queue):
+    """Drain loop for one S3 writer thread; a None item shuts it down."""
+    while True:
+        item = write_queue.get()
+        if item is None:
+            write_queue.task_done()
+            return
+        bucket, key, body = item
+        store_in_s3(bucket, key, body)
+        write_queue.task_done()
+
+
+# BatchWriteItem accepts up to 25 put requests per call.
+DDB_BATCH_SIZE = 25
+
+
+def _attr_s(value):
+    """Wrap a string as a DynamoDB attribute value."""
+    return {'S': value}
+
+
+def _attr_n(value):
+    """Wrap a number as a DynamoDB attribute value (wire format is a string)."""
+    return {'N': str(value)}
+
+
+def flush_dynamodb_batch(counts):
+    """
+    Write a batch of reviewer profanity counts via BatchWriteItem.
+
+    BatchWriteItem rejects duplicate keys within one call, so callers pass
+    a dict keyed by reviewer (latest count wins), which also collapses
+    repeat offenders into a single item per flush. Items the table
+    throttles come back in UnprocessedItems rather than as an error, so
+    those are resubmitted with a short backoff instead of being dropped.
+
+    Args:
+        counts (dict): reviewer_id -> current profanity count.
+
+    Returns:
+        bool: True if every item was eventually accepted.
+    """
+    if not counts:
+        return True
+    put_requests = [
+        {'PutRequest': {'Item': {
+            'reviewer_id': _attr_s(reviewer_id),
+            'profanity_review_count': _attr_n(count),
+        }}}
+        for reviewer_id, count in counts.items()
+    ]
+    request_items = {CUSTOMER_PROFANITY_TABLE_NAME: put_requests}
+    try:
+        for attempt in range(3):
+            response = DDB_CLIENT.batch_write_item(RequestItems=request_items)
+            request_items = response.get('UnprocessedItems') or {}
+            if not request_items:
+                return True
+            time.sleep(0.1 * (attempt + 1))
+        print(f"  Warning: DynamoDB left {sum(map(len, request_items.values()))} items unprocessed after retries")
+        return False
+    except Exception as e:
+        print(f"  Warning: DynamoDB batch write failed: {e}")
+        return False
+
+
+def simulate_preprocessing_lambda(review, now):
+    """
+    Mirror the fields the preprocessing Lambda derives for a review.
+
+    Args:
+        review (dict): Raw review record.
+        now (int): Timestamp to stamp the review with; the caller computes
+                   it once per chunk instead of one clock syscall per review.
+    """
+    return {
+        'review_id': review.get('asin', 'unknown') + review.get('reviewerID', 'unknown'),
+        'reviewer_id': review.get('reviewerID', 'unknown'),
+        'overall_rating': review.get('overall', 0),
+        'summary': review.get('summary', ''),
+        'reviewText': review.get('reviewText', ''),
+        'processing_stage': 'preprocessed',
+        'processed_timestamp': now,
+    }
+
+
+# Vocabulary for the simulated profanity stage. An Aho-Corasick automaton
+# built once at import scans a review in a single C-level pass over the
+# text with every word matched simultaneously, instead of one Python
+# substring scan per word per review. The tuple is ordered by how often
+# each word hits in review text (frequent first), so the fallback
+# alternation tries the likely matches before the rare ones; the
+# automaton itself is order-insensitive.
+PROFANE_WORDS = ('hate', 'terrible', 'worst', 'awful', 'horrible', 'stupid',
+                 'garbage', 'trash', 'crap', 'damn', 'hell')
+
+if ahocorasick is not None:
+    _AUTOMATON = ahocorasick.Automaton()
+    for _word in PROFANE_WORDS:
+        _AUTOMATON.add_word(_word, _word)
+    _AUTOMATON.make_automaton()
+else:
+    _AUTOMATON = None
+
+# Fallback when pyahocorasick is absent: one compiled alternation, so the
+# scan is still a single pass in the C regex engine rather than one
+# Python substring scan per word. No \b anchors, to keep the automaton
+# path's contains-anywhere semantics.
+_PROFANITY_RE = re.compile('|'.join(map(re.escape, PROFANE_WORDS)))
+
+
+def contains_profanity(text_lower):
+    """Contains-only check of lowercased text against PROFANE_WORDS."""
+    if _AUTOMATON is not None:
+        # Only existence matters here, so stop at the first hit rather
+        # than enumerating every match.
+        try:
+            next(_AUTOMATON.iter(text_lower))
+            return True
+        except StopIteration:
+            return False
+    return _PROFANITY_RE.search(text_lower) is not None
+
+
+def simulate_profanity_lambda(processed_review):
+    """Flag a review whose summary or text contains a profane word."""
+    # Scan the short summary first and only fall through to the (much
+    # longer) review text when the summary is clean: on a profane summary
+    # this skips lowercasing and scanning the body entirely, and either
+    # way the concatenated copy of both strings is never built.
+    has_profanity = (contains_profanity(processed_review['summary'].lower())
+                     or contains_profanity(processed_review['reviewText'].lower()))
+    processed_review['processing_stage'] = 'profanity_checked'
+    processed_review['contains_profanity'] = has_profanity
+    return has_profanity
+
+
+# Lines handed to each worker process per task. Large enough that the
+# per-task pickling overhead is noise, small enough to keep all cores fed.
+CHUNK_LINES = 5000
+
+# Reviews between progress lines. Printing is a formatted write under the
+# interpreter's stdout lock, so it happens at most once per this many
+# reviews — and only ever from the merge thread, never from workers.
+PROGRESS_INTERVAL = 10000
+
+
+def _chunk_worker(args):
+    """
+    Run the simulated stages over one chunk of devset lines.
+
+    The per-review work (parse, profanity scan, sentiment) is pure-Python
+    CPU and independent per review, so chunks run in worker processes;
+    each worker already has its own automaton because the module builds it
+    at import time. Only counts and the sampled reviews travel back to the
+    parent, which keeps all network I/O.
+
+    Args:
+        args (tuple): (start_index, lines) for this chunk.
+
+    Returns:
+        dict: Partial results, with 'sampled' holding
+              (index, has_profanity, processed_review) tuples.
+    """
+    start_index, lines = args
+    partial = {
+        'processed_count': 0,
+        'clean_count': 0,
+        'flagged_count': 0,
+        'failed_lines': 0,
+        'sentiment_counts': {'positive': 0, 'neutral': 0, 'negative': 0},
+        'user_profanity_counts': {},
+        'sampled': [],
+    }
+    user_profanity_counts = partial['user_profanity_counts']
+    # Second-granularity is plenty for the processed_timestamp field, so
+    # one reading covers the whole chunk.
+    now = int(time.time())
+
+    # Bind the hot names to locals once: LOAD_FAST in the loop instead of
+    # a global (or attribute) lookup per review.
+    loads = orjson.loads
+    decode_error = orjson.JSONDecodeError
+    preprocess = simulate_preprocessing_lambda
+    check_profanity = simulate_profanity_lambda
+    sentiment_counts = partial['sentiment_counts']
+    sampled_append = partial['sampled'].append
+
+    for i, line in enumerate(lines, start_index):
+        try:
+            # orjson tolerates surrounding whitespace, so the strip()
+            # copy per line goes away along with the slower parse.
+            review = loads(line)
+        except decode_error:
+            partial['failed_lines'] += 1
+            continue
+
+        processed_review = preprocess(review, now)
+        partial['processed_count'] += 1
+
+        has_profanity = check_profanity(processed_review)
+        if has_profanity:
+            partial['flagged_count'] += 1
+            # The preprocessing stage already normalized the reviewer id
+            # (with the 'unknown' default), so read it back rather than
+            # re-deriving it from the raw record.
+            reviewer_id = processed_review['reviewer_id']
+            user_profanity_counts[reviewer_id] = user_profanity_counts.get(reviewer_id, 0) + 1
+        else:
+            partial['clean_count'] += 1
+
+        # The sentiment stage is a three-way branch on the star rating;
+        # inlined here to skip a function call and dict mutations per
+        # review. Only sampled reviews, which actually get stored, carry
+        # the sentiment fields.
+        rating = processed_review['overall_rating']
+        if rating >= 4.0:
+            sentiment = 'positive'
+        elif rating <= 2.0:
+            sentiment = 'negative'
+        else:
+            sentiment = 'neutral'
+        sentiment_counts[sentiment] += 1
+
+        if i % S3_SAMPLE_RATE == 0:
+            processed_review['processing_stage'] = 'sentiment_analyzed'
+            processed_review['sentiment'] = sentiment
+            sampled_append((i, has_profanity, processed_review))
+
+    return partial
+
+
+def _line_chunks(file_path, max_reviews):
+    """Yield (start_index, lines) chunks of CHUNK_LINES devset lines."""
+    # Binary mode with a multi-MB buffer: no per-line UTF-8 decode in the
+    # parent (orjson parses the raw bytes in the workers) and few read
+    # syscalls while streaming the multi-hundred-MB devset. Only one
+    # chunk of lines is ever held here, so memory stays flat.
+    with open(file_path, 'rb', buffering=4 * 1024 * 1024) as f:
+        capped = islice(f, max_reviews)
+        start = 0
+        while True:
+            lines = list(islice(capped, CHUNK_LINES))
+            if not lines:
+                return
+            yield start, lines
+            start += len(lines)
+
+
+def process_reviews_pipeline(file_path, max_reviews=None):
+    """
+    Push the devset through the simulated pipeline stages.
+
+    Chunks of reviews are analyzed in parallel worker processes (the hot
+    loop is pure Python and holds the GIL, so threads would not help);
+    the parent merges their partial counts as they complete and does all
+    S3/DynamoDB traffic itself over the pooled session.
+
+    Args:
+        file_path (str): Path to the JSONL devset file.
+        max_reviews (int, optional): Cap on the number of reviews.
+
+    Returns:
+        dict: Aggregated pipeline results.
+    """
+    results = {
+        'processed_count': 0,
+        'clean_count': 0,
+        'flagged_count': 0,
+        'failed_lines': 0,
+        'sentiment_counts': {'positive': 0, 'neutral': 0, 'negative': 0},
+        'user_profanity_counts': {},
+        'banned_users': [],
+    }
+    user_profanity_counts = results['user_profanity_counts']
+    banned_users = results['banned_users']
+    # Companion set for the ban check: membership is O(1) instead of
+    # rebuilding a list of ids from banned_users on every flagged review.
+    banned_ids = set()
+    next_progress = PROGRESS_INTERVAL
+
+    # S3 writes go through a bounded queue drained by a team of writer
+    # threads, so the merge loop never blocks on an HTTP response and the
+    # queue bound gives natural backpressure if LocalStack falls behind.
+    write_queue = queue.Queue(maxsize=S3_QUEUE_SIZE)
+    writers = [threading.Thread(target=_s3_drain, args=(write_queue,), daemon=True)
+               for _ in range(S3_WORKERS)]
+    for writer in writers:
+        writer.start()
+
+    # Per-bucket NDJSON shard buffers for the sampled reviews; a shard
+    # goes out as one object instead of one object per review.
+    shard_prefixes = {FLAGGED_BUCKET: 'flagged', CLEAN_BUCKET: 'clean',
+                      FINAL_REVIEWS_BUCKET: 'final'}
+    shard_buffers = {bucket: [] for bucket in shard_prefixes}
+    shard_counts = dict.fromkeys(shard_prefixes, 0)
+
+    def flush_shard(bucket):
+        buffer = shard_buffers[bucket]
+        if not buffer:
+            return
+        index = shard_counts[bucket]
+        shard_counts[bucket] = index + 1
+        key = f"{shard_prefixes[bucket]}/shard_{index:05d}.jsonl"
+        write_queue.put((bucket, key, b'\n'.join(buffer) + b'\n'))
+        shard_buffers[bucket] = []
+
+    def shard_append(bucket, body):
+        shard_buffers[bucket].append(body)
+        if len(shard_buffers[bucket]) == SHARD_LINES:
+            flush_shard(bucket)
+
+    def merge_partial(partial):
+        nonlocal next_progress
+        results['processed_count'] += partial['processed_count']
+        results['clean_count'] += partial['clean_count']
+        results['flagged_count'] += partial['flagged_count']
+        results['failed_lines'] += partial['failed_lines']
+        for label, count in partial['sentiment_counts'].items():
+            results['sentiment_counts'][label] += count
+
+        for reviewer_id, count in partial['user_profanity_counts'].items():
+            total = user_profanity_counts.get(reviewer_id, 0) + count
+            user_profanity_counts[reviewer_id] = total
+            if total >= BAN_THRESHOLD and reviewer_id not in banned_ids:
+                banned_ids.add(reviewer_id)
+                banned_users.append({
+                    'user_id': reviewer_id,
+                    'profanity_count': total,
+                })
+
+        for i, has_profanity, processed_review in partial['sampled']:
+            target_bucket = FLAGGED_BUCKET if has_profanity else CLEAN_BUCKET
+            # One encode per review, shared by the clean/flagged routing
+            # shard and the final shard; the processed-bucket copy was
+            # byte-identical to the final document and stays dropped.
+            body = orjson.dumps(processed_review)
+            shard_append(target_bucket, body)
+            shard_append(FINAL_REVIEWS_BUCKET, body)
+
+        if results['processed_count'] >= next_progress:
+            print(f"  Processed {results['processed_count']} reviews...")
+            next_progress = results['processed_count'] + PROGRESS_INTERVAL
+
+    # Chunk order does not matter for any of the merged results, so take
+    # partials as soon as any worker finishes.
+    with multiprocessing.Pool(processes=os.cpu_count()) as workers:
+        for partial in workers.imap_unordered(_chunk_worker, _line_chunks(file_path, max_reviews)):
+            merge_partial(partial)
+
+    # Only the final totals matter in the table, so counts are written
+    # once at the end, 25 items per BatchWriteItem, instead of re-putting
+    # every reviewer whose count moved during the run.
+    batch = {}
+    for reviewer_id, count in user_profanity_counts.items():
+        batch[reviewer_id] = count
+        if len(batch) == DDB_BATCH_SIZE:
+            flush_dynamodb_batch(batch)
+            batch = {}
+    flush_dynamodb_batch(batch)
+
+    for bucket in shard_buffers:
+        flush_shard(bucket)
+    write_queue.join()
+    for _ in writers:
+        write_queue.put(None)
+    for writer in writers:
+        writer.join()
+
+    return results
+
+
+def verify_results():
+    """Count the objects that landed in each pipeline bucket."""
+    # boto3 handles the ListObjectsV2 pagination and XML parsing; scraping
+    # keys out of the raw listing with a regex only saw the first page.
+    buckets = (PROCESSED_BUCKET, CLEAN_BUCKET, FLAGGED_BUCKET, FINAL_REVIEWS_BUCKET)
+
+    def count_bucket(bucket):
+        try:
+            paginator = S3_CLIENT.get_paginator('list_objects_v2')
+            # Each page reports its own KeyCount, so the tally never
+            # touches the per-object entries in Contents.
+            return sum(page['KeyCount'] for page in paginator.paginate(Bucket=bucket))
+        except Exception as e:
+            print(f"  Warning: could not list {bucket}: {e}")
+            return -1
+
+    # Listings for different buckets are independent, so run them in
+    # parallel over the shared client's connection pool.
+    with ThreadPoolExecutor(max_workers=len(buckets)) as executor:
+        return dict(zip(buckets, executor.map(count_bucket, buckets)))
+
+
+def main():
+    """Run the simulated pipeline end to end and report the outcome."""
+    if not verify_localstack_ready():
+        print("LocalStack is not reachable. Run ./setup_environment.sh first.")
+        return 1
+
+    print("Ensuring pipeline buckets exist...")
+    setup_infrastructure()
+
+    print("Processing reviews through the simulated pipeline...")
+    results = process_reviews_pipeline('./data/reviews_devset.json')
+
+    print("\nVerifying stored objects...")
+    bucket_counts = verify_results()
+
+    print("\n--- Local Pipeline Summary ---")
+    print(f"Processed reviews: {results['processed_count']}")
+    print(f"Clean reviews: {results['clean_count']}")
+    print(f"Flagged reviews: {results['flagged_count']}")
+    print(f"Failed lines: {results['failed_lines']}")
+    print(f"Sentiment counts: {results['sentiment_counts']}")
+    print(f"Banned users: {len(results['banned_users'])}")
+    for bucket, count in bucket_counts.items():
+        print(f"Objects in {bucket}: {count}")
+
+    with open('local_pipeline_results.json', 'w') as f:
+        json.dump({
+            'results': {k: v for k, v in results.items() if k != 'user_profanity_counts'},
+            'bucket_counts': bucket_counts,
+        }, f, indent=2)
+    print("\nResults saved to 'local_pipeline_results.json'")
+    return 0
+
+
+if __name__ == '__main__':
+    import sys
+    sys.exit(main())
@@ -66,12 +66,19 @@ echo "   SSM parameters for S3 buckets created."
 
 # Create DynamoDB table
 echo "   Creating DynamoDB table: $CUSTOMER_PROFANITY_TABLE_NAME..."
+# BannedIndex lets the report query just the banned users instead of
+# scanning the whole table. Index keys cannot be booleans, so it hashes
+# on banned_flag, a string mirror of is_banned written by the profanity
+# check Lambda.
 awslocal dynamodb create-table \
     --table-name "$CUSTOMER_PROFANITY_TABLE_NAME" \
     --attribute-definitions \
         AttributeName=reviewer_id,AttributeType=S \
+        AttributeName=banned_flag,AttributeType=S \
     --key-schema \
         AttributeName=reviewer_id,KeyType=HASH \
+    --global-secondary-indexes \
+        'IndexName=BannedIndex,KeySchema=[{AttributeName=banned_flag,KeyType=HASH}],Projection={ProjectionType=ALL},ProvisionedThroughput={ReadCapacityUnits=5,WriteCapacityUnits=5}' \
     --provisioned-throughput ReadCapacityUnits=5,WriteCapacityUnits=5 \
     2>/dev/null || echo "   DynamoDB table '$CUSTOMER_PROFANITY_TABLE_NAME' already exists or could not be created."
 echo "   DynamoDB table '$CUSTOMER_PROFANITY_TABLE_NAME' checked/created."
@@ -12,12 +12,40 @@ from nltk.stem import WordNetLemmatizer
 import logging
 import uuid
 
+# Optional C-extension JSON codec. This function parses whole JSONL
+# batches per invoke, so the line parse and the stored-object encode are
+# linear in batch size; orjson does both several times faster and emits
+# bytes directly. The deployment package ships it, but the handler still
+# runs on stdlib json if it is missing.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _json_loads = orjson.loads
+    _json_decode_error = orjson.JSONDecodeError
+    _dump_review = orjson.dumps
+else:
+    _json_loads = json.loads
+    _json_decode_error = json.JSONDecodeError
+
+    def _dump_review(obj):
+        return json.dumps(obj, indent=2)
+
 
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
 s3_client = boto3.client('s3')
 
+# Built once at import and shared by every invocation: rebuilding the
+# stop-word set re-reads the corpus from disk on each call, and frozenset
+# membership is an O(1) hash lookup per token. The lemmatizer is likewise
+# stateless and safe to reuse.
+STOP_WORDS = frozenset(stopwords.words('english'))
+LEMMATIZER = WordNetLemmatizer()
+
 
 def preprocess_text(text):
     """
@@ -45,12 +73,10 @@ def preprocess_text(text):
     tokens = word_tokenize(text)
     
     # Remove stop words
-    stop_words = set(stopwords.words('english'))
-    filtered_tokens = [word for word in tokens if word not in stop_words and len(word) > 2]
-    
+    filtered_tokens = [word for word in tokens if word not in STOP_WORDS and len(word) > 2]
+
     # Lemmatization
-    lemmatizer = WordNetLemmatizer()
-    lemmatized_tokens = [lemmatizer.lemmatize(word) for word in filtered_tokens]
+    lemmatized_tokens = [LEMMATIZER.lemmatize(word) for word in filtered_tokens]
     
     processed_text = ' '.join(lemmatized_tokens)
     
@@ -153,30 +179,35 @@ def lambda_handler(event, context):
         # Handle both single JSON and JSONL formats
         reviews_to_process = []
         try:
-            reviews_to_process.append(json.loads(file_content))
-        except json.JSONDecodeError:
-            lines = file_content.strip().split('\n')
-            for line in lines:
-                if line.strip():
+            reviews_to_process.append(_json_loads(file_content))
+        except _json_decode_error:
+            # JSONL: iterate splitlines() directly instead of building a
+            # stripped copy of the whole body and a per-line strip; blank
+            # lines are skipped with a copy-free isspace check.
+            for line in file_content.splitlines():
+                if line and not line.isspace():
                     try:
-                        reviews_to_process.append(json.loads(line))
-                    except json.JSONDecodeError as e:
+                        reviews_to_process.append(_json_loads(line))
+                    except _json_decode_error as e:
                         logger.error(f"Skipping malformed JSON line in {object_key}: {line[:100]}... Error: {e}")
                         errors_count += 1
                         continue
         
         original_file_prefix = os.path.splitext(object_key)[0]
+        # The directory part of the key is the same for every review in
+        # the batch, so build it once and only join the id per review.
+        processed_key_prefix = f"processed/{original_file_prefix}/"
 
         for review_data in reviews_to_process:
             processed_review = process_single_review(review_data, object_key)
 
             review_id_for_key = processed_review.get('review_id') or str(uuid.uuid4())
-            processed_key = f"processed/{original_file_prefix}/{review_id_for_key}.json" 
+            processed_key = processed_key_prefix + review_id_for_key + '.json'
 
             s3_client.put_object(
                 Bucket=processed_bucket,
                 Key=processed_key,
-                Body=json.dumps(processed_review, indent=2),
+                Body=_dump_review(processed_review),
                 ContentType='application/json'
             )
             logger.info(f"Successfully processed review '{review_id_for_key}' and saved to {processed_bucket}/{processed_key}")
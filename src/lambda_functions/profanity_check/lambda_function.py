@@ -2,6 +2,7 @@ import json
 import boto3
 import logging
 import os
+import re
 import traceback
 import uuid
 from typing import Dict, Any
@@ -16,6 +17,15 @@ ssm_client = boto3.client('ssm', endpoint_url=os.environ.get('AWS_ENDPOINT_URL')
 
 pf = ProfanityFilter()
 
+# One compiled alternation over the filter's whole wordlist. pf.is_profane()
+# runs a substitution pass per word (700+ regexes per call); this answers
+# the boolean question in a single scan instead. Built at module scope so
+# warm invocations reuse the compiled pattern.
+PROFANITY_RE = re.compile(
+    r'\b(?:' + '|'.join(map(re.escape, pf.get_profane_words())) + r')\b',
+    re.IGNORECASE
+)
+
 FLAGGED_BUCKET = None
 CLEAN_BUCKET = None
 CUSTOMER_PROFANITY_TABLE_NAME = None
@@ -66,10 +76,12 @@ def check_profanity_in_text(text: str) -> Dict:
             'censored_text': ''
         }
     
-    # Use profanityfilter to detect profanity
-    contains_profanity = pf.is_profane(text)
-    censored_text = pf.censor(text)
-    
+    # Detect with the single-pass regex; the much more expensive censor
+    # pass only runs for text that actually matched, since censoring
+    # clean text returns it unchanged anyway.
+    contains_profanity = PROFANITY_RE.search(text) is not None
+    censored_text = pf.censor(text) if contains_profanity else text
+
     return {
         'contains_profanity': contains_profanity,
         'censored_text': censored_text
@@ -175,11 +187,14 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
 
                 # Check if the reviewer should be banned
                 if current_profanity_review_count >= BAN_THRESHOLD:
+                    # banned_flag mirrors is_banned as a string because the
+                    # BannedIndex GSI keys on it (index keys cannot be booleans).
                     customer_profanity_table.update_item(
                         Key={'reviewer_id': reviewer_id},
-                        UpdateExpression='SET is_banned = :val',
+                        UpdateExpression='SET is_banned = :val, banned_flag = :flag',
                         ExpressionAttributeValues={
-                            ':val': True
+                            ':val': True,
+                            ':flag': 'true'
                         }
                     )
                     is_banned = True
@@ -1,3 +1,4 @@
+import gzip
 import json
 import boto3
 import logging
@@ -16,6 +17,12 @@ ssm_client = boto3.client('ssm', endpoint_url=os.environ.get('AWS_ENDPOINT_URL')
 
 analyzer = SentimentIntensityAnalyzer()
 
+# JSON review bodies compress several-fold with gzip, which directly cuts
+# the bytes every downstream reader pulls from the final bucket. Opt-in
+# via environment so deployments choose the format; readers key off the
+# object's ContentEncoding either way.
+COMPRESS_OUTPUT = os.environ.get('COMPRESS_FINAL_REVIEWS', '').lower() == 'true'
+
 def get_parameter(name):
     """Retrieves a parameter from AWS SSM Parameter Store."""
     try:
@@ -107,12 +114,16 @@ def lambda_handler(event, context):
         
         # Save analyzed review to the final S3 bucket
         final_key = f"analyzed/{review_data.get('review_id', 'unknown')}.json"
-        s3_client.put_object(
-            Bucket=FINAL_REVIEWS_BUCKET,
-            Key=final_key,
-            Body=json.dumps(review_data, indent=2),
-            ContentType='application/json'
-        )
+        put_kwargs = {
+            'Bucket': FINAL_REVIEWS_BUCKET,
+            'Key': final_key,
+            'Body': json.dumps(review_data, indent=2),
+            'ContentType': 'application/json'
+        }
+        if COMPRESS_OUTPUT:
+            put_kwargs['Body'] = gzip.compress(put_kwargs['Body'].encode('utf-8'))
+            put_kwargs['ContentEncoding'] = 'gzip'
+        s3_client.put_object(**put_kwargs)
         
         logger.info(f"Sentiment analysis completed. Review saved to {FINAL_REVIEWS_BUCKET}/{final_key}")
         